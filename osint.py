@@ -10,15 +10,29 @@ Descripción: Herramienta OSINT para analistas SOC Tier 1
 # ============================================================================
 
 import sys                      # Salir del programa
+import atexit                   # Cerrar la salida NDJSON al terminar
 import os                       # Manejo de archivos y rutas
 import argparse                 # Procesar argumentos de línea de comandos
 import json                     # Guardar resultados en formato JSON
+import time                     # Control de expiración de la caché
+import shelve                   # Caché persistente en disco
+import functools                # Caché en memoria (lru_cache)
+from collections import OrderedDict  # Caché LRU de respuestas DNS
 from datetime import datetime   # Timestamps para metadatos
-import whois                    # Consultas WHOIS
-import dns.resolver             # Consultas DNS
-import requests                 # Peticiones HTTP (para geolocalización)
+from dataclasses import dataclass, asdict, is_dataclass  # Resultados de puertos
+try:
+    import orjson               # Serialización JSON rápida (opcional)
+except ImportError:
+    orjson = None
+# whois, dnspython y requests se importan dentro de las funciones que los usan:
+# así un análisis de IP no paga el coste de cargar WHOIS/DNS y viceversa.
 import socket                   # Escaneo de puertos
-from concurrent.futures import ThreadPoolExecutor  # Escaneo concurrente
+import struct                   # Opciones de socket (SO_LINGER)
+import asyncio                  # Escaneo concurrente con sockets no bloqueantes
+try:
+    import uvloop               # Bucle de eventos en C (opcional, no disponible en Windows)
+except ImportError:
+    uvloop = None
 
 # ============================================================================
 # MÓDULO DE CONFIGURACIONES
@@ -27,6 +41,48 @@ from concurrent.futures import ThreadPoolExecutor  # Escaneo concurrente
 VERSION = "1.0.0"
 AUTOR = "Enoc Rueda"
 
+# Caché local de consultas externas
+CACHE_GEO = os.path.expanduser("~/.osint_geo_cache")
+TTL_CACHE_GEO = 24 * 60 * 60    # 24 horas
+CACHE_WHOIS = os.path.expanduser("~/.osint_whois_cache")
+TTL_CACHE_WHOIS = 7 * 24 * 60 * 60  # 7 días (los datos WHOIS cambian poco)
+
+# Tiempos de espera del escaneo de puertos (segundos)
+TIMEOUT_CONEXION = 1
+TIMEOUT_BANNER = 2
+TIMEOUT_BANNER_SALUDO = 1
+
+# Máximo de sockets abiertos a la vez durante un escaneo (evita agotar descriptores)
+MAX_CONEXIONES_SIMULTANEAS = 500
+
+# Flag para crear sockets ya no bloqueantes (solo Linux; 0 en otros sistemas)
+SOCK_NO_BLOQUEANTE = getattr(socket, 'SOCK_NONBLOCK', 0)
+
+# SO_LINGER activo con tiempo 0: el cierre envía RST y libera el puerto al instante
+LINGER_RST = struct.pack('ii', 1, 0)
+
+# Servicios que envían su banner al conectar (FTP, SSH, SMTP, POP3, IMAP)
+PUERTOS_SALUDO_SERVIDOR = frozenset({21, 22, 25, 110, 143})
+
+# Sonda específica por servicio para provocar una respuesta identificable
+SONDA_HTTP = b"HEAD / HTTP/1.0\r\n\r\n"
+SONDAS_BANNER = {
+    80: SONDA_HTTP,
+    443: SONDA_HTTP,
+    8080: SONDA_HTTP,
+    8443: SONDA_HTTP,
+    6379: b"*1\r\n$4\r\nPING\r\n",     # Redis: PING en formato RESP
+}
+
+# Máximo de respuestas DNS en la caché en memoria (se respeta el TTL de cada una)
+MAX_CACHE_DNS = 1024
+
+# Máximo de IPs por petición al endpoint /batch de ip-api.com
+TAMANO_LOTE_GEO = 100
+
+# Sesión HTTP compartida (se crea en el primer uso, ver _obtener_sesion)
+_SESION = None
+
 # Diccionario de puertos comunes para identificación rápida
 PUERTOS_COMUNES = {
     21: 'FTP',
@@ -54,17 +110,227 @@ PUERTOS_COMUNES = {
     8443: 'HTTPS-Alt'
 }
 
+# Tabla indexada por número de puerto (0-65535): búsqueda O(1) sin hashing
+_SERVICIO_POR_PUERTO = [None] * 65536
+for _puerto, _servicio in PUERTOS_COMUNES.items():
+    _SERVICIO_POR_PUERTO[_puerto] = _servicio
+del _puerto, _servicio
+
+# ============================================================================
+# MÓDULO DE ESTRUCTURAS DE DATOS
+# ============================================================================
+
+@dataclass
+class ResultadoPuerto:
+    """
+    Puerto abierto encontrado durante el escaneo.
+
+    Usa __slots__ para ocupar menos memoria que un dict por resultado.
+    """
+    __slots__ = ('puerto', 'estado', 'servicio', 'banner')
+
+    puerto: int
+    estado: str
+    servicio: str
+    banner: str
+
+# ============================================================================
+# FUNCIÓN: EJECUTAR CORRUTINAS
+# ============================================================================
+
+def _ejecutar_async(corrutina):
+    """
+    Ejecuta una corrutina en un bucle de eventos nuevo.
+
+    Usa uvloop si está instalado, sin cambiar la política global de asyncio;
+    si no, recurre a asyncio.run.
+
+    Args:
+        corrutina: Corrutina a ejecutar.
+
+    Returns:
+        El valor devuelto por la corrutina.
+    """
+    if uvloop is None:
+        return asyncio.run(corrutina)
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(corrutina)
+    if hasattr(uvloop, 'run'):
+        return uvloop.run(corrutina)
+    return asyncio.run(corrutina)
+
+# ============================================================================
+# FUNCIONES: CACHÉ EN DISCO
+# ============================================================================
+
+def _leer_cache_varios(ruta, claves, ttl):
+    """
+    Lee varias entradas vigentes de la caché en disco abriéndola una sola vez.
+
+    Args:
+        ruta (str): Ruta del archivo de caché (shelve).
+        claves (list): Claves de las entradas.
+        ttl (int): Antigüedad máxima en segundos.
+
+    Returns:
+        dict: {clave: datos} solo con las entradas encontradas y no expiradas.
+    """
+    encontradas = {}
+    ahora = time.time()
+    try:
+        with shelve.open(ruta) as cache:
+            for clave in claves:
+                entrada = cache.get(clave)
+                if entrada and ahora - entrada['ts'] < ttl:
+                    encontradas[clave] = entrada['data']
+    except Exception:
+        return {}
+    return encontradas
+
+
+def _guardar_cache_varios(ruta, entradas):
+    """
+    Guarda varias entradas en la caché en disco abriéndola una sola vez.
+
+    Args:
+        ruta (str): Ruta del archivo de caché (shelve).
+        entradas (dict): {clave: datos} (los datos deben ser serializables con pickle).
+    """
+    if not entradas:
+        return
+    ahora = time.time()
+    try:
+        with shelve.open(ruta) as cache:
+            for clave, datos in entradas.items():
+                cache[clave] = {'ts': ahora, 'data': datos}
+    except Exception:
+        # La caché es opcional: un fallo al escribir no debe romper el análisis
+        pass
+
+
+def _leer_cache(ruta, clave, ttl):
+    """
+    Lee una entrada de la caché en disco si sigue vigente.
+
+    Args:
+        ruta (str): Ruta del archivo de caché (shelve).
+        clave (str): Clave de la entrada.
+        ttl (int): Antigüedad máxima en segundos.
+
+    Returns:
+        Los datos guardados o None si no existen o han expirado.
+    """
+    return _leer_cache_varios(ruta, [clave], ttl).get(clave)
+
+
+def _guardar_cache(ruta, clave, datos):
+    """
+    Guarda una entrada en la caché en disco junto con su timestamp.
+
+    Args:
+        ruta (str): Ruta del archivo de caché (shelve).
+        clave (str): Clave de la entrada.
+        datos: Datos a guardar (deben ser serializables con pickle).
+    """
+    _guardar_cache_varios(ruta, {clave: datos})
+
 # ============================================================================
 # FUNCIÓN: GEO IP (geolocalización)
 # ============================================================================
 
-def geo_ip(ip, verbose=False):
+def _obtener_sesion():
+    """
+    Devuelve la sesión HTTP compartida, creándola en la primera llamada.
+
+    La sesión mantiene la conexión abierta (keep-alive) entre consultas.
+
+    Returns:
+        requests.Session: Sesión con pool de conexiones y reintentos.
+    """
+    global _SESION
+    if _SESION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        _SESION = requests.Session()
+        _SESION.headers.update({"User-Agent": f"osint-soc/{VERSION}"})
+        _SESION.mount("http://", HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=10,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        ))
+    return _SESION
+
+
+def _formatear_geo(data):
+    """
+    Convierte una respuesta de ip-api.com al formato de resultados del toolkit.
+
+    Args:
+        data (dict): Respuesta JSON de ip-api.com con status 'success'.
+
+    Returns:
+        dict: Diccionario con datos de geolocalización.
+    """
+    return {
+        'Ip': data.get('query'),
+        'Pais': data.get('country'),
+        'Region': data.get('regionName'),
+        'Ciudad': data.get('city'),
+        'Latitud': data.get('lat'),
+        'Longitud': data.get('lon'),
+        'Isp': data.get('isp'),
+        'Organizacion': data.get('org')
+    }
+
+
+def _consultar_ip_api(ip):
+    """
+    Consulta ip-api.com y devuelve los datos de geolocalización formateados.
+
+    Args:
+        ip (str): Dirección IP a analizar.
+
+    Returns:
+        dict: Diccionario con datos de geolocalización.
+
+    Raises:
+        ValueError: Si la API responde con un estado de error.
+    """
+    url = f"http://ip-api.com/json/{ip}"
+    response = _obtener_sesion().get(url, timeout=5)
+    data = response.json()
+
+    if data.get('status') != 'success':
+        raise ValueError(data.get('message', 'desconocido'))
+
+    return _formatear_geo(data)
+
+
+@functools.lru_cache(maxsize=256)
+def _geo_ip_cacheado(ip):
+    """
+    Geolocalización con caché en memoria (lru_cache) y en disco (TTL 24h).
+
+    Los errores no se cachean: la excepción se propaga al llamador.
+    """
+    resultado = _leer_cache(CACHE_GEO, ip, TTL_CACHE_GEO)
+    if resultado is None:
+        resultado = _consultar_ip_api(ip)
+        _guardar_cache(CACHE_GEO, ip, resultado)
+    return resultado
+
+
+def geo_ip(ip, verbose=False, usar_cache=True):
     """
     Obtiene la información de geolocalización de una IP usando ip-api.com.
 
     Args:
         ip (str): Dirección IP a analizar.
         verbose (bool): Si es True, muestra información detallada.
+        usar_cache (bool): Si es False, ignora la caché y consulta la API.
 
     Returns:
         dict: Diccionario con datos de geolocalización o None si hay error.
@@ -72,109 +338,228 @@ def geo_ip(ip, verbose=False):
     print(f"\n📍 Consultando geolocalización para {ip}...")
     
     try:
-        url = f"http://ip-api.com/json/{ip}"
-        response = requests.get(url, timeout=5)
-        data = response.json()
-
-        if data.get('status') == 'success':
-            resultado = {
-                'Ip': data.get('query'),
-                'Pais': data.get('country'),
-                'Region': data.get('regionName'),
-                'Ciudad': data.get('city'),
-                'Latitud': data.get('lat'),
-                'Longitud': data.get('lon'),
-                'Isp': data.get('isp'),
-                'Organizacion': data.get('org')
-            }
-
-            print("✅ Geolocalización encontrada con éxito.")
-            if verbose:
-                print(f"   País: {resultado['Pais']}")
-                print(f"   Ciudad: {resultado['Ciudad']}")
-                print(f"   ISP: {resultado['Isp']}")
-            return resultado
+        if usar_cache:
+            resultado = dict(_geo_ip_cacheado(ip))
         else:
-            print(f"❌ Error: {data.get('message', 'desconocido')}")
-            return None
+            resultado = _consultar_ip_api(ip)
+
+        print("✅ Geolocalización encontrada con éxito.")
+        if verbose:
+            print(f"   País: {resultado['Pais']}")
+            print(f"   Ciudad: {resultado['Ciudad']}")
+            print(f"   ISP: {resultado['Isp']}")
+        return resultado
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return None
     except Exception as e:
         print(f"❌ Error en geolocalización: {e}")
         return None
 
+
+def geo_ip_bulk(ips, verbose=False, usar_cache=True):
+    """
+    Geolocaliza varias IPs usando el endpoint /batch de ip-api.com
+    (hasta 100 IPs por petición, una sola ida y vuelta por bloque).
+
+    Args:
+        ips (list): Direcciones IP a analizar.
+        verbose (bool): Si es True, muestra información detallada.
+        usar_cache (bool): Si es False, ignora la caché y consulta la API.
+
+    Returns:
+        dict: Diccionario {ip: datos de geolocalización o None si hay error}.
+    """
+    print(f"\n📍 Consultando geolocalización para {len(ips)} IPs...")
+
+    # La caché en disco se abre una sola vez para todo el lote
+    resultados = _leer_cache_varios(CACHE_GEO, ips, TTL_CACHE_GEO) if usar_cache else {}
+    pendientes = [ip for ip in ips if ip not in resultados]
+    nuevos = {}
+
+    for i in range(0, len(pendientes), TAMANO_LOTE_GEO):
+        bloque = pendientes[i:i + TAMANO_LOTE_GEO]
+        try:
+            response = _obtener_sesion().post(
+                "http://ip-api.com/batch",
+                json=[{"query": ip} for ip in bloque],
+                timeout=10
+            )
+            response.raise_for_status()
+            respuestas = response.json()
+            if not isinstance(respuestas, list):
+                raise ValueError(f"respuesta inesperada de /batch: {respuestas}")
+        except Exception as e:
+            print(f"❌ Error en geolocalización por lotes: {e}")
+            for ip in bloque:
+                resultados[ip] = None
+            continue
+
+        for ip, data in zip(bloque, respuestas):
+            if not isinstance(data, dict):
+                print(f"❌ Error en {ip}: respuesta inválida")
+                resultados[ip] = None
+            elif data.get('status') == 'success':
+                resultados[ip] = _formatear_geo(data)
+                nuevos[ip] = resultados[ip]
+            else:
+                print(f"❌ Error en {ip}: {data.get('message', 'desconocido')}")
+                resultados[ip] = None
+
+    if usar_cache:
+        _guardar_cache_varios(CACHE_GEO, nuevos)
+
+    encontradas = sum(1 for ip in ips if resultados.get(ip))
+    print(f"✅ Geolocalización encontrada para {encontradas}/{len(ips)} IPs.")
+    if verbose:
+        for ip in ips:
+            if resultados.get(ip):
+                geo = resultados[ip]
+                print(f"   {ip}: {geo['Pais']} / {geo['Ciudad']} / {geo['Isp']}")
+    return {ip: resultados.get(ip) for ip in ips}
+
 # ============================================================================
 # FUNCIÓN: ESCANEO DE UN PUERTO INDIVIDUAL
 # ============================================================================
 
-def escan_puerto(ip, puerto, timeout=1):
+async def escan_puerto_async(ip, puerto, servicio=None, timeout=TIMEOUT_CONEXION, familia=None):
     """
-    Escanea un puerto específico en una IP.
+    Escanea un puerto específico en una IP usando sockets no bloqueantes.
 
     Args:
-        ip (str): IP a escanear.
+        ip (str): IP a escanear (IPv4 o IPv6).
         puerto (int): Puerto a probar.
-        timeout (int): Timeout en segundos.
+        servicio (str): Nombre del servicio ya conocido. Si es None, se busca
+            en la tabla de puertos comunes.
+        timeout (int): Timeout de conexión en segundos.
+        familia (int): Familia de direcciones (AF_INET/AF_INET6). Si es None,
+            se resuelve con getaddrinfo.
 
     Returns:
-        dict: Información del puerto si está abierto, None si cerrado.
+        ResultadoPuerto: Información del puerto si está abierto, None si cerrado.
     """
+    loop = asyncio.get_running_loop()
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(timeout)
-        resultado = sock.connect_ex((ip, puerto))
-        sock.close()
-        if resultado == 0:
-            # Puerto abierto, intentar obtener banner
-            try:
-                banner_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                banner_sock.settimeout(2)
-                banner_sock.connect((ip, puerto))
-                banner_sock.send(b"HEAD / HTTP/1.0\r\n\r\n")
-                banner = banner_sock.recv(1024).decode('utf-8', errors='ignore')[:100]
-                banner_sock.close()
-            except:
-                banner = "No disponible"
-            
-            return {
-                'puerto': puerto,
-                'estado': 'abierto',
-                'servicio': PUERTOS_COMUNES.get(puerto, 'desconocido'),
-                'banner': banner
-            }
+        if familia is None:
+            familia, _, _, _, direccion = (
+                await loop.getaddrinfo(ip, puerto, type=socket.SOCK_STREAM)
+            )[0]
+        else:
+            direccion = (ip, puerto)
+        # En Linux el socket nace no bloqueante (SOCK_NONBLOCK), sin syscall extra
+        sock = socket.socket(familia, socket.SOCK_STREAM | SOCK_NO_BLOQUEANTE)
+    except Exception:
         return None
-    except:
+
+    conectado = False
+    try:
+        if not SOCK_NO_BLOQUEANTE:
+            sock.setblocking(False)
+        # Cerrar con RST en vez de dejar el puerto efímero en TIME_WAIT
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, LINGER_RST)
+        await asyncio.wait_for(loop.sock_connect(sock, direccion), timeout)
+        reader, writer = await asyncio.open_connection(sock=sock)
+        conectado = True
+    except Exception:
         return None
+    finally:
+        if not conectado:
+            sock.close()
+
+    # Puerto abierto, intentar obtener banner en la misma conexión solo
+    # cuando el protocolo lo permite; el resto se reporta abierto sin esperar.
+    banner = "No disponible"
+    try:
+        if puerto in PUERTOS_SALUDO_SERVIDOR:
+            # El servidor envía su saludo nada más conectar: basta con leer
+            datos = await asyncio.wait_for(reader.read(1024), TIMEOUT_BANNER_SALUDO)
+            banner = datos.decode('utf-8', errors='ignore')[:100]
+        elif puerto in SONDAS_BANNER:
+            writer.write(SONDAS_BANNER[puerto])
+            await writer.drain()
+            datos = await asyncio.wait_for(reader.read(1024), TIMEOUT_BANNER)
+            banner = datos.decode('utf-8', errors='ignore')[:100]
+    except Exception:
+        pass
+    finally:
+        writer.close()
+
+    return ResultadoPuerto(
+        puerto=puerto,
+        estado='abierto',
+        servicio=servicio or _SERVICIO_POR_PUERTO[puerto] or 'desconocido',
+        banner=banner
+    )
 
 # ============================================================================
 # FUNCIÓN: ESCANEO DE PUERTOS COMUNES (CONCURRENTE)
 # ============================================================================
 
-def escanear_puertos_comunes(ip, verbose=False):
+def escanear_puertos_comunes(ip, verbose=False, timeout=TIMEOUT_CONEXION):
     """
-    Escanea los puertos más comunes en una IP usando threads.
+    Escanea los puertos más comunes en una IP usando asyncio.
+
+    Los resultados se procesan en orden de finalización y el escaneo completo
+    tiene un tiempo límite: si se alcanza, los puertos pendientes se cancelan.
 
     Args:
         ip (str): IP a escanear.
         verbose (bool): Si es True, muestra detalles de cada puerto abierto.
+        timeout (int): Timeout de conexión por puerto en segundos.
 
     Returns:
-        list: Lista de diccionarios con información de puertos abiertos.
+        list: Lista de ResultadoPuerto con los puertos abiertos.
     """
     print(f"\n🔍 Escaneando puertos comunes en {ip}...")
-    
-    puertos_a_escanear = list(PUERTOS_COMUNES.keys())
-    puertos_abiertos = []
-    
-    with ThreadPoolExecutor(max_workers=20) as executor:
-        futures = {executor.submit(escan_puerto, ip, puerto): puerto 
-                   for puerto in puertos_a_escanear}
-        
-        for future in futures:
-            resultado = future.result()
-            if resultado:
-                puertos_abiertos.append(resultado)
-                if verbose:
-                    print(f"   ✅ Puerto {resultado['puerto']}: {resultado['servicio']} (abierto)")
-    
+
+    # Resolver una sola vez: la familia (IPv4/IPv6) es la misma para todos los puertos
+    try:
+        familia, _, _, _, sockaddr = socket.getaddrinfo(ip, None, type=socket.SOCK_STREAM)[0]
+    except socket.gaierror as e:
+        print(f"   ❌ No se pudo resolver {ip}: {e}")
+        return []
+    direccion = sockaddr[0]
+
+    # Cada tarea ya está acotada por sus propios wait_for; este límite global
+    # solo evita que una conexión colgada bloquee el escaneo completo. Con el
+    # semáforo los puertos se prueban en rondas de MAX_CONEXIONES_SIMULTANEAS.
+    rondas = -(-len(PUERTOS_COMUNES) // MAX_CONEXIONES_SIMULTANEAS)
+    limite = rondas * (timeout + TIMEOUT_BANNER) + 1
+
+    async def _escanear():
+        # Todas las conexiones no bloqueantes comparten el mismo bucle de eventos
+        # (epoll en Linux); el semáforo limita los sockets abiertos a la vez.
+        semaforo = asyncio.Semaphore(MAX_CONEXIONES_SIMULTANEAS)
+
+        async def _escan_limitado(puerto, servicio):
+            async with semaforo:
+                return await escan_puerto_async(direccion, puerto, servicio, timeout, familia)
+
+        # El nombre del servicio se conoce de antemano: se pasa ya resuelto
+        tareas = [asyncio.ensure_future(_escan_limitado(puerto, servicio))
+                  for puerto, servicio in PUERTOS_COMUNES.items()]
+        encontrados = []
+        try:
+            for siguiente in asyncio.as_completed(tareas, timeout=limite):
+                try:
+                    resultado = await siguiente
+                except asyncio.TimeoutError:
+                    raise
+                except Exception:
+                    continue
+                if resultado:
+                    encontrados.append(resultado)
+                    if verbose:
+                        print(f"   ✅ Puerto {resultado.puerto}: {resultado.servicio} (abierto)")
+        except asyncio.TimeoutError:
+            print("   ⚠  Tiempo límite alcanzado, se cancelan los puertos pendientes.")
+        finally:
+            for tarea in tareas:
+                tarea.cancel()
+        return encontrados
+
+    puertos_abiertos = sorted(_ejecutar_async(_escanear()), key=lambda p: p.puerto)
+
     print(f"   📊 Puertos abiertos encontrados: {len(puertos_abiertos)}")
     return puertos_abiertos
 
@@ -211,13 +596,53 @@ def cargar_configuracion():
 # FUNCIÓN: CONSULTA WHOIS
 # ============================================================================
 
-def consultar_whois(dominio, verbose=False):
+def _consultar_whois_servidor(dominio):
+    """
+    Consulta el servidor WHOIS y extrae los campos relevantes.
+
+    Args:
+        dominio (str): El dominio a consultar.
+
+    Returns:
+        dict: Información WHOIS del dominio.
+    """
+    import whois
+
+    w = whois.whois(dominio)
+
+    return {
+        'dominio': dominio,
+        'registrar': str(w.registrar) if w.registrar else None,
+        'fecha_creacion': str(w.creation_date[0]) if isinstance(w.creation_date, list) else str(w.creation_date),
+        'fecha_expiracion': str(w.expiration_date[0]) if isinstance(w.expiration_date, list) else str(w.expiration_date),
+        'servidores_dns': [str(ns) for ns in (w.name_servers or [])],
+        'pais': str(w.country) if w.country else None,
+        'org': str(w.org) if w.org else None
+    }
+
+
+@functools.lru_cache(maxsize=512)
+def _whois_cacheado(dominio):
+    """
+    WHOIS con caché en memoria (lru_cache) y en disco (TTL 7 días).
+
+    Los errores no se cachean: la excepción se propaga al llamador.
+    """
+    resultado = _leer_cache(CACHE_WHOIS, dominio, TTL_CACHE_WHOIS)
+    if resultado is None:
+        resultado = _consultar_whois_servidor(dominio)
+        _guardar_cache(CACHE_WHOIS, dominio, resultado)
+    return resultado
+
+
+def consultar_whois(dominio, verbose=False, usar_cache=True):
     """
     Consulta WHOIS para un dominio.
 
     Args:
         dominio (str): El dominio a consultar.
         verbose (bool): Si es True, muestra información detallada.
+        usar_cache (bool): Si es False, ignora la caché y consulta el servidor.
 
     Returns:
         dict: Información WHOIS o None si hay error.
@@ -225,17 +650,11 @@ def consultar_whois(dominio, verbose=False):
     print(f"\n🔍 Consultando WHOIS para {dominio}...")
     
     try:
-        w = whois.whois(dominio)
-        
-        resultado = {
-            'dominio': dominio,
-            'registrar': str(w.registrar) if w.registrar else None,
-            'fecha_creacion': str(w.creation_date[0]) if isinstance(w.creation_date, list) else str(w.creation_date),
-            'fecha_expiracion': str(w.expiration_date[0]) if isinstance(w.expiration_date, list) else str(w.expiration_date),
-            'servidores_dns': [str(ns) for ns in (w.name_servers or [])],
-            'pais': str(w.country) if w.country else None,
-            'org': str(w.org) if w.org else None
-        }
+        if usar_cache:
+            resultado = dict(_whois_cacheado(dominio.lower()))
+            resultado['dominio'] = dominio
+        else:
+            resultado = _consultar_whois_servidor(dominio)
         
         print("   ✅ WHOIS completado.")
         if verbose:
@@ -253,54 +672,129 @@ def consultar_whois(dominio, verbose=False):
 # FUNCIÓN: CONSULTA DNS
 # ============================================================================
 
-def consultar_dns(dominio, verbose=False):
+# Caché en memoria: (dominio, tipo) -> respuesta, en orden LRU
+_cache_dns = OrderedDict()
+
+
+def _leer_cache_dns(clave):
+    """
+    Devuelve la respuesta DNS cacheada si no ha expirado.
+
+    Se usa Answer.expiration, que dnspython calcula con el TTL mínimo de toda
+    la cadena (incluidos los CNAME), como instante absoluto.
+
+    Args:
+        clave (tuple): (dominio, tipo de registro).
+
+    Returns:
+        dns.resolver.Answer: Respuesta cacheada o None.
+    """
+    respuestas = _cache_dns.get(clave)
+    if respuestas is None:
+        return None
+    if time.time() >= respuestas.expiration:
+        del _cache_dns[clave]
+        return None
+    _cache_dns.move_to_end(clave)
+    return respuestas
+
+
+def _guardar_cache_dns(clave, respuestas):
+    """
+    Guarda una respuesta DNS y descarta la menos usada si se supera el límite.
+
+    Args:
+        clave (tuple): (dominio, tipo de registro).
+        respuestas (dns.resolver.Answer): Respuesta a cachear.
+    """
+    _cache_dns[clave] = respuestas
+    _cache_dns.move_to_end(clave)
+    if len(_cache_dns) > MAX_CACHE_DNS:
+        _cache_dns.popitem(last=False)
+
+
+async def _resolver_tipos_dns(dominio, tipos, usar_cache=True):
+    """
+    Lanza en paralelo las consultas DNS de todos los tipos de registro.
+
+    Args:
+        dominio (str): El dominio a consultar.
+        tipos (list): Tipos de registro a consultar.
+        usar_cache (bool): Si es False, ignora la caché en memoria.
+
+    Returns:
+        list: Tuplas (tipo, respuesta) en el mismo orden que `tipos`; si la
+        consulta falla, la respuesta es la excepción producida.
+    """
+    import dns.asyncresolver
+
+    async def _q(tipo):
+        clave = (dominio.lower(), tipo)
+        if usar_cache:
+            respuestas = _leer_cache_dns(clave)
+            if respuestas is not None:
+                return tipo, respuestas
+        try:
+            respuestas = await dns.asyncresolver.resolve(dominio, tipo)
+        except Exception as e:
+            return tipo, e
+        _guardar_cache_dns(clave, respuestas)
+        return tipo, respuestas
+
+    return await asyncio.gather(*[_q(tipo) for tipo in tipos])
+
+
+def consultar_dns(dominio, verbose=False, usar_cache=True):
     """
     Consulta registros DNS de un dominio.
 
     Args:
         dominio (str): El dominio a consultar.
         verbose (bool): Si es True, muestra detalles.
+        usar_cache (bool): Si es False, ignora la caché DNS en memoria.
 
     Returns:
         dict: Diccionario con los registros encontrados o None si el dominio no existe.
     """
+    import dns.resolver
+
     print(f"\n🔍 Consultando DNS para {dominio}...")
     
     tipos = ['A', 'AAAA', 'MX', 'TXT', 'NS', 'CNAME']
     resultados = {}
     
-    for tipo in tipos:
-        try:
-            respuestas = dns.resolver.resolve(dominio, tipo)
-            registros = []
-            
-            for respuesta in respuestas:
-                if tipo == 'MX':
-                    registros.append({
-                        'prioridad': respuesta.preference,
-                        'servidor': str(respuesta.exchange).rstrip('.')
-                    })
-                elif tipo == 'TXT':
-                    txt_strings = [str(s) for s in respuesta.strings]
-                    registros.append(' '.join(txt_strings))
-                else:
-                    registros.append(str(respuesta).rstrip('.'))
-            
-            if registros:
-                resultados[tipo] = registros
-                
-                if verbose:
-                    print(f"   • {tipo}: {len(registros)} registros")
-                    
-        except dns.resolver.NoAnswer:
+    for tipo, respuestas in _ejecutar_async(_resolver_tipos_dns(dominio, tipos, usar_cache)):
+        if isinstance(respuestas, dns.resolver.NoAnswer):
             # No hay registros de este tipo (normal)
-            pass
-        except dns.resolver.NXDOMAIN:
+            continue
+        if isinstance(respuestas, dns.resolver.NXDOMAIN):
             print(f"   ❌ El dominio {dominio} no existe.")
             return None
-        except Exception as e:
+        if isinstance(respuestas, Exception):
             if verbose:
-                print(f"   ⚠  Error en {tipo}: {e}")
+                print(f"   ⚠  Error en {tipo}: {respuestas}")
+            continue
+
+        # El tipo se decide una vez por rrset, no en cada registro
+        if tipo == 'MX':
+            registros = [
+                {
+                    'prioridad': respuesta.preference,
+                    'servidor': respuesta.exchange.to_text(omit_final_dot=True)
+                }
+                for respuesta in respuestas
+            ]
+        elif tipo == 'TXT':
+            registros = [b''.join(respuesta.strings).decode('utf-8', 'ignore')
+                         for respuesta in respuestas]
+        else:
+            registros = [respuesta.to_text().rstrip('.') for respuesta in respuestas]
+        
+        if registros:
+            resultados[tipo] = registros
+            
+            if verbose:
+                print(f"   • {tipo}: {len(registros)} registros")
     
     print(f"   ✅ DNS completado ({len(resultados)} tipos encontrados).")
     return resultados
@@ -323,17 +817,116 @@ def procesar_argumentos():
 EJEMPLOS:
   python3 osint.py -d ejemplo.com
   python3 osint.py -i 8.8.8.8
+  python3 osint.py -i 8.8.8.8 1.1.1.1 9.9.9.9
   python3 osint.py -d ejemplo.com -o reporte.json -v
         """
     )
 
     grupo = parser.add_mutually_exclusive_group(required=True)
     grupo.add_argument('-d', '--dominio', help='Dominio a investigar')
-    grupo.add_argument('-i', '--ip', help='IP a analizar')
-    parser.add_argument('-o', '--output', help='Archivo de salida JSON')
+    grupo.add_argument('-i', '--ip', nargs='+', help='IP(s) a analizar')
+    parser.add_argument('-o', '--output', help='Archivo de salida JSON (NDJSON, una línea por sección, si se analizan varias IPs)')
     parser.add_argument('-v', '--verbose', action='store_true', help='Mostrar información detallada')
+    parser.add_argument('--sin-cache', action='store_true', help='Ignorar la caché local y consultar siempre las fuentes')
     return parser.parse_args()
 
+# ============================================================================
+# FUNCIÓN: GUARDAR RESULTADOS EN JSON
+# ============================================================================
+
+def _serializar_json(obj):
+    """Convierte a JSON los objetos que el módulo json no soporta de serie."""
+    if is_dataclass(obj):
+        return asdict(obj)
+    return str(obj)
+
+
+def guardar_json(resultados, ruta):
+    """
+    Guarda los resultados en un archivo JSON indentado.
+
+    Usa orjson si está instalado; si no, recurre al módulo json estándar.
+
+    Args:
+        resultados (dict): Resultados del análisis.
+        ruta (str): Ruta del archivo de salida.
+    """
+    if orjson is not None:
+        with open(ruta, 'wb') as f:
+            # orjson serializa las dataclasses (ResultadoPuerto) de forma nativa
+            f.write(orjson.dumps(
+                resultados,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ))
+    else:
+        # Mismo resultado que orjson: UTF-8 sin escapar los caracteres no ASCII
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False, default=_serializar_json)
+
+# ============================================================================
+# FUNCIONES: SALIDA NDJSON EN STREAMING (varios objetivos)
+# ============================================================================
+
+def abrir_ndjson(ruta):
+    """
+    Abre el archivo de salida NDJSON y garantiza su cierre al salir.
+
+    Args:
+        ruta (str): Ruta del archivo de salida.
+
+    Returns:
+        file: Archivo abierto en modo binario.
+    """
+    salida = open(ruta, 'wb')
+    # Al salir (incluido Ctrl+C) se vuelca lo pendiente y se cierra el archivo
+    atexit.register(salida.close)
+    return salida
+
+
+def escribir_ndjson(salida, registro):
+    """
+    Escribe un registro como una línea JSON y la vuelca a disco de inmediato.
+
+    Args:
+        salida (file): Archivo abierto con abrir_ndjson.
+        registro (dict): Resultado parcial a guardar.
+    """
+    if orjson is not None:
+        linea = orjson.dumps(registro, default=str, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        linea = json.dumps(registro, ensure_ascii=False, default=_serializar_json).encode('utf-8')
+    salida.write(linea + b"\n")
+    salida.flush()
+
+# ============================================================================
+# FUNCIÓN: RESUMEN DE IP
+# ============================================================================
+
+def mostrar_resumen_ip(ip, geo, puertos):
+    """
+    Muestra el resumen de geolocalización y puertos abiertos de una IP.
+
+    Args:
+        ip (str): IP analizada.
+        geo (dict): Datos de geolocalización o None.
+        puertos (list): Puertos abiertos encontrados.
+    """
+    print(f"\n📌 Resumen de IP ({ip}):")
+    print("-" * 30)
+    if geo:
+        print(f"   País: {geo.get('Pais')}")
+        print(f"   Ciudad: {geo.get('Ciudad')}")
+        print(f"   ISP: {geo.get('Isp')}")
+        print(f"   Latitud: {geo.get('lat')}")
+        print(f"   Longitud: {geo.get('lon')}")
+    if puertos:
+        print(f"   Puertos abiertos: {len(puertos)}")
+        for p in puertos:
+            print(f"     {p.puerto}: {p.servicio}")
+    else:
+        print("   No se encontraron puertos comunes abiertos.")
+
 # ============================================================================
 # FUNCIÓN PRINCIPAL
 # ============================================================================
@@ -349,10 +942,14 @@ def main():
     if args.dominio:
         print(f"   Análisis a: DOMINIO")
         print(f"   Dominio objetivo: {args.dominio}")
-    elif args.ip:
+    elif len(args.ip) == 1:
         print(f"   Análisis a: IP")
-        print(f"   IP Objetivo: {args.ip}")
+        print(f"   IP Objetivo: {args.ip[0]}")
+    else:
+        print(f"   Análisis a: IPs ({len(args.ip)})")
+        print(f"   IPs Objetivo: {', '.join(args.ip)}")
     print(f"   Verbose: {'SÍ' if args.verbose else 'NO'}")
+    print(f"   Caché: {'NO' if args.sin_cache else 'SÍ'}")
     if args.output:
         print(f"   Guardar en: {args.output}")
 
@@ -360,7 +957,7 @@ def main():
     resultados = {
         'metadata': {
             'fecha': datetime.now().isoformat(),
-            'objetivo': args.dominio or args.ip,
+            'objetivo': args.dominio or (args.ip[0] if len(args.ip) == 1 else args.ip),
             'tipo_de_analisis': 'dominio' if args.dominio else 'IP',
             'herramienta': f'OSINT-SOC-Toolkit v{VERSION}'
         },
@@ -374,33 +971,41 @@ def main():
     if args.dominio:
         print("\n🔎 Iniciando investigación del dominio")
         print("=" * 50)
-        resultados['whois'] = consultar_whois(args.dominio, args.verbose)
-        resultados['dns'] = consultar_dns(args.dominio, args.verbose)
-    elif args.ip:
+        resultados['whois'] = consultar_whois(args.dominio, args.verbose, not args.sin_cache)
+        resultados['dns'] = consultar_dns(args.dominio, args.verbose, not args.sin_cache)
+    elif len(args.ip) == 1:
+        ip = args.ip[0]
         print("\n🔎 Iniciando investigación de la IP")
         print("=" * 50)
-        resultados['geo'] = geo_ip(args.ip, args.verbose)
-        resultados['puertos'] = escanear_puertos_comunes(args.ip, args.verbose)
-        
-        print("\n📌 Resumen de IP:")
-        print("-" * 30)
-        if resultados['geo']:
-            print(f"   País: {resultados['geo'].get('Pais')}")
-            print(f"   Ciudad: {resultados['geo'].get('Ciudad')}")
-            print(f"   ISP: {resultados['geo'].get('Isp')}")
-            print(f"   Latitud: {resultados['geo'].get('lat')}")
-            print(f"   Longitud: {resultados['geo'].get('lon')}")      
-        if resultados['puertos']:
-            print(f"   Puertos abiertos: {len(resultados['puertos'])}")
-            for p in resultados['puertos']:
-                print(f"     {p['puerto']}: {p['servicio']}")
-        else:
-            print("   No se encontraron puertos comunes abiertos.")
+        resultados['geo'] = geo_ip(ip, args.verbose, not args.sin_cache)
+        resultados['puertos'] = escanear_puertos_comunes(ip, args.verbose)
+        mostrar_resumen_ip(ip, resultados['geo'], resultados['puertos'])
+    else:
+        # Varios objetivos: cada resultado parcial se guarda como una línea
+        # NDJSON en cuanto se obtiene, sin acumular el informe en memoria.
+        ips = list(dict.fromkeys(args.ip))
+        print(f"\n🔎 Iniciando investigación de {len(ips)} IPs")
+        print("=" * 50)
+        salida = abrir_ndjson(args.output) if args.output else None
+        if salida:
+            print(f"   ℹ  Varias IPs: {args.output} se escribe en formato NDJSON (una línea JSON por sección).")
+            escribir_ndjson(salida, {'seccion': 'metadata', 'datos': resultados['metadata']})
+
+        geos = geo_ip_bulk(ips, args.verbose, not args.sin_cache)
+        if salida:
+            for ip in ips:
+                escribir_ndjson(salida, {'objetivo': ip, 'seccion': 'geo', 'datos': geos[ip]})
+
+        for ip in ips:
+            puertos = escanear_puertos_comunes(ip, args.verbose)
+            if salida:
+                escribir_ndjson(salida, {'objetivo': ip, 'seccion': 'puertos', 'datos': puertos})
+            mostrar_resumen_ip(ip, geos[ip], puertos)
 
-    # Guardar resultados si se solicitó
+    # Guardar resultados si se solicitó (en modo NDJSON ya se fueron escribiendo)
     if args.output:
-        with open(args.output, 'w') as f:
-            json.dump(resultados, f, indent=2, default=str)
+        if args.dominio or len(args.ip) == 1:
+            guardar_json(resultados, args.output)
         print(f"\n💾 Resultados guardados en {args.output}")
 
     # Resumen final